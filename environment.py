@@ -1,9 +1,202 @@
 import math
-from collections import deque
-from typing import List, Optional, Tuple
+from functools import lru_cache
+from typing import Optional, Tuple
 
 import numpy as np
 
+# Compiled generator, in order of preference: the AOT Cython extension (no
+# JIT warmup), then numba, then the pure-Python fallbacks below.
+try:
+    from env_core import generate_solvable_grid
+except ImportError:
+    try:
+        from utils_numba import generate_solvable_grid
+    except ImportError:
+        generate_solvable_grid = None
+
+# Optional scipy acceleration for the pure-Python generation path: a C-level
+# connected-component reject plus a C shortest-path on small grids.
+try:
+    from scipy import ndimage
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import shortest_path as _csgraph_shortest_path
+except ImportError:
+    ndimage = None
+
+
+def _sample_grid(random_state: np.random.RandomState, grid_size: int, hole_prob: float) -> np.ndarray:
+    """Sample a single grid without validating solvability."""
+
+    probs = random_state.random_sample((grid_size, grid_size))
+    grid = np.ones((grid_size, grid_size), dtype=np.int8)
+    grid[probs < hole_prob] = 2  # Hole
+    grid[0, 0] = 0  # Start
+    grid[-1, -1] = 3  # Goal
+
+    return grid
+
+
+def _bfs_shortest_py(
+    grid: np.ndarray,
+    n: int,
+    visited: np.ndarray,
+    cells: np.ndarray,
+    dists: np.ndarray,
+) -> int:
+    """Pure-Python shortest path from start to goal avoiding holes.
+
+    Fallback for when no compiled kernel is available; returns -1 when the
+    goal is unreachable. ``visited``, ``cells``, and ``dists`` are
+    caller-provided scratch of size n*n so the rejection loop reuses the
+    same allocations across attempts. The queue is the (cells, dists) pair
+    with head/tail cursors: each cell is enqueued at most once, so no
+    wrap-around is needed and a push is two array writes instead of a
+    deque node holding a tuple.
+    """
+
+    visited.fill(0)
+    visited[0] = 1
+
+    goal = n * n - 1
+    flat = grid.ravel()
+    cells[0] = 0
+    dists[0] = 0
+    head, tail = 0, 1
+
+    # Neighbor checks are inlined rather than factored into a helper:
+    # a method call plus a list of candidate tuples per visited cell is
+    # most of the cost of this loop.
+    while head < tail:
+        idx = int(cells[head])
+        dist = int(dists[head])
+        head += 1
+
+        if idx == goal:
+            return dist
+
+        r, c = divmod(idx, n)
+        if c > 0:
+            nidx = idx - 1
+            if not visited[nidx] and flat[nidx] != 2:
+                visited[nidx] = 1
+                cells[tail] = nidx
+                dists[tail] = dist + 1
+                tail += 1
+        if c < n - 1:
+            nidx = idx + 1
+            if not visited[nidx] and flat[nidx] != 2:
+                visited[nidx] = 1
+                cells[tail] = nidx
+                dists[tail] = dist + 1
+                tail += 1
+        if r > 0:
+            nidx = idx - n
+            if not visited[nidx] and flat[nidx] != 2:
+                visited[nidx] = 1
+                cells[tail] = nidx
+                dists[tail] = dist + 1
+                tail += 1
+        if r < n - 1:
+            nidx = idx + n
+            if not visited[nidx] and flat[nidx] != 2:
+                visited[nidx] = 1
+                cells[tail] = nidx
+                dists[tail] = dist + 1
+                tail += 1
+
+    return -1
+
+
+def _shortest_path_scipy(grid: np.ndarray, n: int) -> int:
+    """Shortest start-to-goal path via scipy's compiled graph search.
+
+    Builds the 4-adjacency graph over non-hole cells as a csr_matrix and
+    runs one C-level shortest_path call instead of an interpreted BFS.
+    Returns -1 when the goal is unreachable.
+    """
+
+    ids = np.arange(n * n).reshape(n, n)
+    open_cells = grid != 2
+
+    right = open_cells[:, :-1] & open_cells[:, 1:]
+    down = open_cells[:-1, :] & open_cells[1:, :]
+    u = np.concatenate([ids[:, :-1][right], ids[:-1, :][down]])
+    v = np.concatenate([ids[:, 1:][right], ids[1:, :][down]])
+
+    adj = csr_matrix(
+        (np.ones(u.shape[0], dtype=np.int8), (u, v)), shape=(n * n, n * n)
+    )
+    dist = _csgraph_shortest_path(adj, directed=False, unweighted=True, indices=0)
+
+    goal_dist = dist[n * n - 1]
+    return -1 if np.isinf(goal_dist) else int(goal_dist)
+
+
+@lru_cache(maxsize=256)
+def _generate_grid_pure(
+    grid_size: int,
+    hole_prob: float,
+    min_path_length_ratio: float,
+    max_attempts: int,
+    seed: int,
+) -> np.ndarray:
+    """Generate an accepted grid deterministically from the given seed.
+
+    Pure in its arguments, so results are memoized: when a seed recurs with
+    identical parameters (e.g. cyclic eval seeds) the whole rejection loop is
+    skipped. Callers must copy the returned array before mutating it.
+    """
+
+    min_required = math.ceil(min_path_length_ratio * grid_size)
+
+    if generate_solvable_grid is not None:
+        grid, ok = generate_solvable_grid(
+            grid_size, hole_prob, min_required, max_attempts, seed
+        )
+        if not ok:
+            raise RuntimeError(
+                "Failed to generate a solvable grid within the attempt limit."
+            )
+        return grid
+
+    random_state = np.random.RandomState(seed)
+    n_cells = grid_size * grid_size
+    visited = np.empty(n_cells, dtype=np.uint8)
+    cells = np.empty(n_cells, dtype=np.int32)
+    dists = np.empty(n_cells, dtype=np.int32)
+
+    for _ in range(max_attempts):
+        grid = _sample_grid(random_state, grid_size, hole_prob)
+
+        # Free O(1) rejects before any graph work: a start or goal whose two
+        # neighbors are both holes can never be connected.
+        if grid[0, 1] == 2 and grid[1, 0] == 2:
+            continue
+        if grid[-1, -2] == 2 and grid[-2, -1] == 2:
+            continue
+
+        if ndimage is not None:
+            # Reject disconnected start/goal instantly with one C-level
+            # component labelling; most failures at high hole_prob die here.
+            labels, _ = ndimage.label(grid != 2)
+            if labels[0, 0] != labels[-1, -1]:
+                continue
+            if grid_size <= 8:
+                # Small graphs: one compiled shortest_path call beats the
+                # interpreted BFS.
+                shortest_path = _shortest_path_scipy(grid, grid_size)
+            else:
+                shortest_path = _bfs_shortest_py(grid, grid_size, visited, cells, dists)
+        else:
+            shortest_path = _bfs_shortest_py(grid, grid_size, visited, cells, dists)
+
+        if shortest_path < min_required:
+            continue
+
+        return grid
+
+    raise RuntimeError("Failed to generate a solvable grid within the attempt limit.")
+
 
 class Environment:
     """Configurable Frozen Lake environment with solvable random map generation."""
@@ -38,18 +231,44 @@ class Environment:
         self.min_path_length_ratio = min_path_length_ratio
         self.max_generation_attempts = max_generation_attempts
         self.random_state = np.random.RandomState(seed)
+        # Bound-method cache skips one attribute lookup per step.
+        self._rng_randint = self.random_state.randint
+        # Slip probability rescaled to the top 30 bits of a uint32 draw so the
+        # slip test needs no float multiply per step.
+        self._slip_threshold = int(slip_prob * (1 << 30))
 
         self.state_grid = None
-        self.state: Tuple[int, int] = (0, 0)
+        self._idx = 0  # Flat state index (row * n_cols + col)
         self.done = False
 
         self.action_space = [0, 1, 2, 3]  # 0=left, 1=right, 2=up, 3=down
         self.n_actions = len(self.action_space)
 
+        # Per-cell-value reward and termination lookups (indices are cell values).
+        self._reward = np.array([0.0, 0.0, -5.0, 10.0], dtype=np.float32)
+        self._done = np.array([False, False, True, True])
+
+        # Per-cell-value render lookups: glyphs for render_text, RGB for pygame.
+        self._char_lut = np.array([" S ", " F ", " H ", " G "])
+        self._color_lut = np.array(
+            [
+                [0, 102, 204],  # Start - blue
+                [173, 216, 230],  # Frozen - light blue
+                [30, 30, 30],  # Hole - dark
+                [0, 200, 0],  # Goal - green
+            ],
+            dtype=np.uint8,
+        )
+
         self._generate_grid()
         self.n_rows, self.n_cols = self.state_grid.shape
         self.n_states = self.n_rows * self.n_cols
         self.obs_size = self._compute_obs_size()
+        self._onehot_table = np.eye(self.n_states, dtype=np.float32)
+        # Rows of this table are handed out as views; freeze it so a caller
+        # mutating one fails loudly instead of corrupting every later lookup.
+        self._onehot_table.setflags(write=False)
+        self._build_step_tables()
 
     # ------------------------------------------------------------------
     # Map generation
@@ -57,81 +276,67 @@ class Environment:
     def _generate_grid(self) -> None:
         """Generate a solvable random grid that satisfies difficulty constraints."""
 
-        attempts = 0
-        while attempts < self.max_generation_attempts:
-            attempts += 1
-            grid = self._sample_grid()
-            shortest_path = self._shortest_path_length(grid)
-
-            if shortest_path is None:
-                continue
-
-            min_required = math.ceil(self.min_path_length_ratio * self.grid_size)
-            if shortest_path < min_required:
-                continue
-
-            self.state_grid = grid
-            return
-
-        raise RuntimeError("Failed to generate a solvable grid within the attempt limit.")
-
-    def _sample_grid(self) -> np.ndarray:
-        """Sample a single grid without validating solvability."""
-
-        grid = np.ones((self.grid_size, self.grid_size), dtype=np.int8)
-        grid[0, 0] = 0  # Start
-        grid[-1, -1] = 3  # Goal
-
-        for r in range(self.grid_size):
-            for c in range(self.grid_size):
-                if (r, c) in [(0, 0), (self.grid_size - 1, self.grid_size - 1)]:
-                    continue
-
-                if self.random_state.rand() < self.hole_prob:
-                    grid[r, c] = 2  # Hole
-
-        return grid
-
-    def _shortest_path_length(self, grid: np.ndarray) -> Optional[int]:
-        """Return the shortest path length from start to goal avoiding holes."""
-
-        start, goal = (0, 0), (self.grid_size - 1, self.grid_size - 1)
-        queue: deque = deque([(start, 0)])
-        visited = {start}
-
-        while queue:
-            (r, c), dist = queue.popleft()
-            if (r, c) == goal:
-                return dist
+        seed = int(self.random_state.randint(0, 2**31 - 1))
+        self.state_grid = _generate_grid_pure(
+            self.grid_size,
+            self.hole_prob,
+            self.min_path_length_ratio,
+            self.max_generation_attempts,
+            seed,
+        ).copy()
+
+    def _build_step_tables(self) -> None:
+        """Precompute the transition table and flat grid used by step().
+
+        _next_state[idx, action] holds the destination index for every
+        (cell, action) pair with edge clamping already applied, so step()
+        reduces to a couple of array lookups.
+        """
 
-            for nr, nc in self._neighbors(r, c):
-                if grid[nr, nc] == 2:
-                    continue
-                if (nr, nc) not in visited:
-                    visited.add((nr, nc))
-                    queue.append(((nr, nc), dist + 1))
+        idx = np.arange(self.n_states, dtype=np.int32)
+        rows, cols = np.divmod(idx, self.n_cols)
 
-        return None
+        self._next_state = np.empty((self.n_states, 4), dtype=np.int32)
+        self._next_state[:, 0] = np.where(cols > 0, idx - 1, idx)
+        self._next_state[:, 1] = np.where(cols < self.n_cols - 1, idx + 1, idx)
+        self._next_state[:, 2] = np.where(rows > 0, idx - self.n_cols, idx)
+        self._next_state[:, 3] = np.where(rows < self.n_rows - 1, idx + self.n_cols, idx)
 
-    def _neighbors(self, r: int, c: int) -> List[Tuple[int, int]]:
-        """Return valid neighbor coordinates for a cell."""
+        # 1-D C-contiguous view of the grid: flat integer indexing is a much
+        # cheaper NumPy code path than 2-D tuple indexing, and it is the
+        # layout the compiled kernels expect.
+        self.state_grid = np.ascontiguousarray(self.state_grid)
+        self._flat_grid = self.state_grid.ravel()
 
-        candidates = [
-            (r, c - 1),
-            (r, c + 1),
-            (r - 1, c),
-            (r + 1, c),
-        ]
+        # Cached map encoding for state_to_one_hot; only the position part of
+        # the observation changes between steps on a fixed grid.
+        self._map_onehot = np.eye(4, dtype=np.float32)[self._flat_grid].reshape(-1)
 
-        return [
-            (nr, nc)
-            for nr, nc in candidates
-            if 0 <= nr < self.grid_size and 0 <= nc < self.grid_size
-        ]
+        # SoA split of the grid: hot-path code only needs "is hole" and
+        # "is goal", so pack each into its own bitmap. The full int8 grid is
+        # kept for rendering and observations. Even a 64x64 mask fits in a
+        # handful of cache lines.
+        self._hole_bits = np.packbits(self._flat_grid == 2)
+        self._goal_bits = np.packbits(self._flat_grid == 3)
 
     # ------------------------------------------------------------------
     # RL interface
     # ------------------------------------------------------------------
+    @property
+    def state(self) -> Tuple[int, int]:
+        """Current position as a (row, col) tuple.
+
+        Internally the position is a single flat index so the hot loop never
+        allocates or unpacks tuples; the tuple is only built here for the
+        public API.
+        """
+        return divmod(self._idx, self.n_cols)
+
+    @state.setter
+    def state(self, value: Tuple[int, int]) -> None:
+        row, col = value
+        self._idx = row * self.n_cols + col
+
     def reset(self) -> Tuple[int, int]:
         """Reset the environment to the start state and optionally regenerate the map."""
 
@@ -139,8 +344,12 @@ class Environment:
             self._generate_grid()
             self.n_rows, self.n_cols = self.state_grid.shape
             self.n_states = self.n_rows * self.n_cols
+            if self._onehot_table.shape[0] != self.n_states:
+                self._onehot_table = np.eye(self.n_states, dtype=np.float32)
+                self._onehot_table.setflags(write=False)
+            self._build_step_tables()
 
-        self.state = (0, 0)
+        self._idx = 0
         self.done = False
         self.obs_size = self._compute_obs_size()
         return self.state
@@ -148,52 +357,45 @@ class Environment:
     def step(self, action: int):
         """Take a step in the environment with stochastic slipping."""
 
-        row, col = self.state
-        if self.random_state.rand() < self.slip_prob:
-            action = self.random_state.choice(self.action_space)
-
-        if action == 0:
-            new_state = (row, max(col - 1, 0))
-        elif action == 1:
-            new_state = (row, min(col + 1, self.n_cols - 1))
-        elif action == 2:
-            new_state = (max(row - 1, 0), col)
-        elif action == 3:
-            new_state = (min(row + 1, self.n_rows - 1), col)
-        else:
+        # One uint32 draw decides both whether the agent slips (top 30 bits)
+        # and, if so, where to (low 2 bits), halving RNG calls per step.
+        u = int(self._rng_randint(0, 2**32, dtype=np.uint32))
+        if (u >> 2) < self._slip_threshold:
+            action = u & 3
+
+        if not 0 <= action < self.n_actions:
             raise ValueError(f"Invalid action {action}")
 
-        cell_value = self.state_grid[new_state]
-        if cell_value == 3:
-            reward, done = 10.0, True
-        elif cell_value == 2:
-            reward, done = -5.0, True
-        else:
-            reward, done = 0.0, False
+        new_idx = int(self._next_state[self._idx, action])
+        byte, bit = divmod(new_idx, 8)
+        shift = 7 - bit
+        is_hole = (self._hole_bits[byte] >> shift) & 1
+        is_goal = (self._goal_bits[byte] >> shift) & 1
+        reward = float(self._reward[2 * is_hole + 3 * is_goal])
+        done = bool(is_hole | is_goal)
 
-        self.state = new_state
+        self._idx = new_idx
         self.done = done
-        return action, new_state, reward, done
+        return action, self.state, reward, done
 
     # ------------------------------------------------------------------
     # Representations
     # ------------------------------------------------------------------
     def pos_to_one_hot(self, row: int, col: int) -> np.ndarray:
-        idx = row * self.n_cols + col
-        one_hot = np.zeros(self.n_states, dtype=np.float32)
-        one_hot[idx] = 1.0
-        return one_hot
+        """Return the one-hot encoding of a position.
+
+        The result is a read-only view into a cached identity table; callers
+        that need to mutate it should copy first.
+        """
+        return self._onehot_table[row * self.n_cols + col]
 
     def state_to_one_hot(self, state: Tuple[int, int]) -> np.ndarray:
         """Return observation = one-hot map layout + agent position one-hot."""
 
-        map_one_hot = np.eye(4, dtype=np.float32)[self.state_grid.flatten()]
-        map_flat = map_one_hot.reshape(-1)
-
         row, col = state
         pos_features = self.pos_to_one_hot(row, col)
 
-        return np.concatenate([map_flat, pos_features]).astype(np.float32)
+        return np.concatenate([self._map_onehot, pos_features])
 
     def _compute_obs_size(self) -> int:
         """Observation size when encoding full map (4 classes) + position."""
@@ -205,16 +407,10 @@ class Environment:
     def render_text(self) -> str:
         """Return a human-readable text representation of the grid."""
 
-        char_map = {0: "S", 1: "F", 2: "H", 3: "G"}
-        result = ""
-        for r in range(self.n_rows):
-            for c in range(self.n_cols):
-                if (r, c) == self.state:
-                    result += " X "
-                else:
-                    result += f" {char_map[self.state_grid[r, c]]} "
-            result += "\n"
-        return result
+        chars = self._char_lut[self.state_grid]
+        row, col = self.state
+        chars[row, col] = " X "
+        return "".join("".join(line) + "\n" for line in chars)
 
     def render_pygame(self, cell_size: int = 80) -> None:
         """Render the environment using pygame.
@@ -225,16 +421,11 @@ class Environment:
 
         import pygame
 
-        colors = {
-            0: (0, 102, 204),  # Start - blue
-            1: (173, 216, 230),  # Frozen - light blue
-            2: (30, 30, 30),  # Hole - dark
-            3: (0, 200, 0),  # Goal - green
-        }
         agent_color = (255, 165, 0)
+        width, height = self.n_cols * cell_size, self.n_rows * cell_size
 
         pygame.init()
-        screen = pygame.display.set_mode((self.n_cols * cell_size, self.n_rows * cell_size))
+        screen = pygame.display.set_mode((width, height))
         pygame.display.set_caption("Frozen Lake")
 
         for event in pygame.event.get():
@@ -242,11 +433,18 @@ class Environment:
                 pygame.quit()
                 return
 
-        for r in range(self.n_rows):
-            for c in range(self.n_cols):
-                rect = pygame.Rect(c * cell_size, r * cell_size, cell_size, cell_size)
-                pygame.draw.rect(screen, colors[self.state_grid[r, c]], rect)
-                pygame.draw.rect(screen, (255, 255, 255), rect, 2)
+        # One gather through the color LUT and a single blit instead of a
+        # Rect + draw.rect call per cell; grid lines are O(N) line draws.
+        rgb = self._color_lut[self.state_grid]
+        surface = rgb.repeat(cell_size, axis=0).repeat(cell_size, axis=1)
+        pygame.surfarray.blit_array(screen, surface.transpose(1, 0, 2))
+
+        for r in range(self.n_rows + 1):
+            y = min(r * cell_size, height - 1)
+            pygame.draw.line(screen, (255, 255, 255), (0, y), (width, y), 2)
+        for c in range(self.n_cols + 1):
+            x = min(c * cell_size, width - 1)
+            pygame.draw.line(screen, (255, 255, 255), (x, 0), (x, height), 2)
 
         ar, ac = self.state
         center = (ac * cell_size + cell_size // 2, ar * cell_size + cell_size // 2)
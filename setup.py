@@ -0,0 +1,27 @@
+"""Build script for the optional compiled environment core.
+
+Usage:
+    python setup.py build_ext --inplace
+
+Requires Cython and a C compiler. The resulting env_core extension is
+picked up automatically by environment.py; without it the code falls back
+to numba and then to pure Python.
+"""
+
+import numpy as np
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+extensions = [
+    Extension(
+        "env_core",
+        ["env_core.pyx"],
+        include_dirs=[np.get_include()],
+        define_macros=[("NPY_NO_DEPRECATED_API", "NPY_1_7_API_VERSION")],
+    )
+]
+
+setup(
+    name="env_core",
+    ext_modules=cythonize(extensions, language_level=3),
+)
@@ -1,5 +1,7 @@
 import argparse
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -121,10 +123,17 @@ def train(args):
 def test(args):
     """Test a trained DQN agent on the Frozen Lake environment.
 
+    Episodes run concurrently in a thread pool: each worker owns its own
+    Environment and RNG, and the compiled environment kernels release the
+    GIL so stepping and map generation overlap across workers. The one
+    shared Keras model is not thread-safe, so action selection is
+    serialized behind a lock. Transcripts are collected per episode and
+    printed in order once all episodes finish.
+
     Args:
         args: Command line arguments
     """
-    # Create the environment
+    # Create a sizing environment for the agent's input dimensions
     env = Environment(
         grid_size=args.grid_size,
         hole_prob=args.hole_prob,
@@ -133,57 +142,93 @@ def test(args):
         min_path_length_ratio=args.min_path_ratio,
         seed=args.seed,
     )
-    
+
     # Create the agent
     agent = DQNAgent(
         state_size=env.obs_size,
         action_size=env.n_actions
     )
-    
+
     # Load the trained model
     agent.load(args.model)
-    
+
+    # No exploration during testing
+    agent.epsilon = 0.0
+
     # Testing setup
     n_episodes = args.test_episodes
     max_steps = args.max_steps
-    rewards_history = []
-    
-    # Testing loop
-    for episode in range(n_episodes):
-        # Reset environment
-        state_tuple = env.reset()
-        state = env.state_to_one_hot(state_tuple)
+
+    # Keras models are not thread-safe: concurrent predict calls race on the
+    # lazily-built predict function, so workers take turns on the agent.
+    agent_lock = threading.Lock()
+
+    # With --static-map every episode must run on the same grid, so all
+    # workers share one seed (drawn once when none was given). Otherwise each
+    # episode gets its own offset stream.
+    if args.static_map:
+        static_seed = args.seed if args.seed is not None else int(np.random.randint(0, 2**31 - 1))
+
+    def run_episode(episode):
+        """Run one greedy episode in its own environment; return (reward, transcript)."""
+        if args.static_map:
+            episode_seed = static_seed
+        elif args.seed is None:
+            episode_seed = None
+        else:
+            episode_seed = args.seed + episode
+
+        episode_env = Environment(
+            grid_size=args.grid_size,
+            hole_prob=args.hole_prob,
+            slip_prob=args.slip_prob,
+            randomize_on_reset=not args.static_map,
+            min_path_length_ratio=args.min_path_ratio,
+            seed=episode_seed,
+        )
+
+        lines = []
+        state_tuple = episode_env.reset()
+        state = episode_env.state_to_one_hot(state_tuple)
         total_reward = 0
-        
-        print(f"Episode {episode+1}/{n_episodes}")
-        print(env.render_text())
-        
+
+        lines.append(episode_env.render_text())
+
         for step in range(max_steps):
-            # Get action from agent (no exploration during testing)
-            agent.epsilon = 0.0
-            action = agent.get_action(state)
-            
+            # Get action from agent
+            with agent_lock:
+                action = agent.get_action(state)
+
             # Take step in environment
-            actual_action, next_state_tuple, reward, done = env.step(action)
-            next_state = env.state_to_one_hot(next_state_tuple)
-            
-            print(f"Action: {action}, State: {next_state_tuple}, Reward: {reward}")
-            print(env.render_text())
-            
+            actual_action, next_state_tuple, reward, done = episode_env.step(action)
+            next_state = episode_env.state_to_one_hot(next_state_tuple)
+
+            lines.append(f"Action: {action}, State: {next_state_tuple}, Reward: {reward}")
+            lines.append(episode_env.render_text())
+
             # Update state and total reward
             state = next_state
             total_reward += reward
-            
+
             # If episode is done, break
             if done:
                 break
-        
+
+        return total_reward, "\n".join(lines)
+
+    # Run episodes in parallel, one environment per worker
+    max_workers = min(n_episodes, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(run_episode, range(n_episodes)))
+
+    rewards_history = []
+    for episode, (total_reward, transcript) in enumerate(results):
+        print(f"Episode {episode+1}/{n_episodes}")
+        print(transcript)
         print(f"Episode {episode+1} finished with reward {total_reward}")
         print("-" * 40)
-        
-        # Save episode reward
         rewards_history.append(total_reward)
-    
+
     # Print average reward
     print(f"Average reward over {n_episodes} episodes: {np.mean(rewards_history)}")
 
@@ -0,0 +1,159 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from environment import Environment
+
+try:
+    from env_core import step_batch
+except ImportError:  # optional compiled core; NumPy path below covers it
+    step_batch = None
+
+
+class VectorEnvironment:
+    """Batch of independent Frozen Lake environments stepped together.
+
+    Holds ``n_envs`` grids as one ``(B, N, N)`` int8 tensor and applies every
+    step to all of them with vectorized NumPy, so the per-step Python overhead
+    is amortized over the whole batch. Episodes that terminate are reset
+    automatically in the same call.
+    """
+
+    def __init__(
+        self,
+        n_envs: int,
+        grid_size: int = 4,
+        hole_prob: float = 0.2,
+        slip_prob: float = 0.2,
+        randomize_on_reset: bool = True,
+        min_path_length_ratio: float = 1.25,
+        seed: Optional[int] = None,
+        max_generation_attempts: int = 500,
+    ) -> None:
+        """Initialize the batched environment.
+
+        Args:
+            n_envs: Number of independent environments in the batch.
+            grid_size: Size of each square grid.
+            hole_prob: Base probability of placing a hole in each non-terminal cell.
+            slip_prob: Probability of slipping to a random direction when acting.
+            randomize_on_reset: Regenerate a new map whenever an episode ends.
+            min_path_length_ratio: Minimum ratio between shortest path length and
+                grid size to filter out trivially easy mazes.
+            seed: Optional random seed for reproducibility.
+            max_generation_attempts: Maximum attempts to sample a solvable grid.
+        """
+
+        self.n_envs = n_envs
+        self.slip_prob = slip_prob
+        self.randomize_on_reset = randomize_on_reset
+        self._slip_threshold = int(slip_prob * (1 << 30))
+
+        # Single-env instance that owns the RNG and the map-generation logic;
+        # grids for the batch are drawn from it one at a time.
+        self._proto = Environment(
+            grid_size=grid_size,
+            hole_prob=hole_prob,
+            slip_prob=slip_prob,
+            randomize_on_reset=True,
+            min_path_length_ratio=min_path_length_ratio,
+            seed=seed,
+            max_generation_attempts=max_generation_attempts,
+        )
+        self.random_state = self._proto.random_state
+
+        self.n_rows = self._proto.n_rows
+        self.n_cols = self._proto.n_cols
+        self.n_states = self._proto.n_states
+        self.obs_size = self._proto.obs_size
+        self.action_space = self._proto.action_space
+        self.n_actions = self._proto.n_actions
+
+        self._reward = self._proto._reward
+        self._done = self._proto._done
+        self._next_state = self._proto._next_state
+        self._onehot_table = self._proto._onehot_table
+        self._map_eye = np.eye(4, dtype=np.float32)
+
+        self._grids = np.empty((n_envs, self.n_rows, self.n_cols), dtype=np.int8)
+        self._flat_grids = self._grids.reshape(n_envs, -1)
+        self._map_onehots = np.empty((n_envs, self.n_states * 4), dtype=np.float32)
+        self._idx = np.zeros(n_envs, dtype=np.int32)
+        self._arange = np.arange(n_envs)
+
+        self._generate_grids(self._arange)
+
+    def _generate_grids(self, env_ids: np.ndarray) -> None:
+        """Regenerate the grids (and cached map encodings) for the given envs."""
+
+        for i in env_ids:
+            self._proto._generate_grid()
+            self._grids[i] = self._proto.state_grid
+            self._map_onehots[i] = self._map_eye[self._flat_grids[i]].reshape(-1)
+
+    def reset(self) -> np.ndarray:
+        """Reset every environment and return the batch of flat state indices."""
+
+        if self.randomize_on_reset:
+            self._generate_grids(self._arange)
+        self._idx[:] = 0
+        return self._idx.copy()
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Step all environments at once with stochastic slipping.
+
+        Mirrors Environment.step but over the batch: returns the actually
+        executed actions, the next flat state indices, rewards, and done
+        flags. Environments whose episode ended are reset in place (and get a
+        fresh map when randomize_on_reset is set); the returned values still
+        describe the terminal transition.
+
+        Args:
+            actions: Integer array of shape (n_envs,) with the intended actions.
+
+        Returns:
+            Tuple of (actions, next_idx, rewards, dones) arrays of shape (n_envs,).
+        """
+
+        actions = np.asarray(actions)
+        # One batched uint32 draw decides both the slip test (top 30 bits)
+        # and the slipped-to action (low 2 bits) for every env.
+        u = self.random_state.randint(0, 2**32, size=self.n_envs, dtype=np.uint32)
+        actions = np.where((u >> 2) < self._slip_threshold, u & 3, actions)
+        actions = np.ascontiguousarray(actions, dtype=np.int32)
+
+        if step_batch is not None:
+            # Compiled nogil path: advances _idx in place and fills the
+            # reward/done outputs in one pass over the batch.
+            rewards = np.empty(self.n_envs, dtype=np.float32)
+            done_flags = np.empty(self.n_envs, dtype=np.uint8)
+            step_batch(
+                self._idx, actions, self._next_state, self._flat_grids,
+                rewards, done_flags,
+            )
+            new_idx = self._idx.copy()
+            dones = done_flags != 0
+        else:
+            new_idx = self._next_state[self._idx, actions]
+            cells = self._flat_grids[self._arange, new_idx]
+            rewards = self._reward[cells]
+            dones = self._done[cells]
+            self._idx = new_idx.astype(np.int32)
+
+        if dones.any():
+            done_ids = np.nonzero(dones)[0]
+            if self.randomize_on_reset:
+                self._generate_grids(done_ids)
+            self._idx[done_ids] = 0
+
+        return actions, new_idx, rewards, dones
+
+    def states_to_one_hot(self) -> np.ndarray:
+        """Return the (n_envs, obs_size) batch of observations.
+
+        Each row is the cached one-hot map layout concatenated with the agent
+        position one-hot, matching Environment.state_to_one_hot.
+        """
+
+        pos_features = self._onehot_table[self._idx]
+        return np.concatenate([self._map_onehots, pos_features], axis=1)